@@ -5,8 +5,12 @@ import sqlite3
 import plotly.express as px
 import matplotlib.pyplot as plt 
 import seaborn as sns 
+import numpy as np
 
 DB_NAME = 'expenses.db'
+SAMPLE_TABLE = 'expenses_sample'
+STRATA_TABLE = 'expenses_strata'
+Z_95 = 1.96
 
 
 def run_query(query):
@@ -27,6 +31,53 @@ def run_query(query):
             conn.close()
 
 
+def estimate_sum(sample_df, value_col, group_col=None, mask=None):
+    """Estimates SUM(value_col) per group from the stratified sample.
+
+    Each month x category stratum is scaled by Stratum_Rows / Sample_Rows. Rows outside
+    `mask` (or outside a group) count as zero, so groups and date ranges that cut across
+    strata are handled as domain estimates. Margin is the half-width of a 95% confidence interval.
+    """
+    values = sample_df[value_col] if mask is None else sample_df[value_col].where(mask, 0.0)
+    groups = sample_df[group_col] if group_col else pd.Series('All', index=sample_df.index)
+
+    per_stratum = (pd.DataFrame({'Group': groups, 'Month': sample_df['Month'], 'Category': sample_df['Category'],
+                                 'Stratum_Rows': sample_df['Stratum_Rows'], 'Sample_Rows': sample_df['Sample_Rows'],
+                                 'z': values, 'z2': values ** 2})
+                   .groupby(['Group', 'Month', 'Category', 'Stratum_Rows', 'Sample_Rows'])[['z', 'z2']].sum()
+                   .reset_index())
+
+    N, n = per_stratum['Stratum_Rows'], per_stratum['Sample_Rows']
+    variance_z = ((per_stratum['z2'] - per_stratum['z'] ** 2 / n) / (n - 1)).where(n > 1, 0.0).clip(lower=0.0)
+    per_stratum['Estimate'] = N * per_stratum['z'] / n
+    per_stratum['Variance'] = N ** 2 * (1 - n / N) * variance_z / n
+
+    totals = per_stratum.groupby('Group')[['Estimate', 'Variance']].sum()
+    result = pd.DataFrame({value_col: totals['Estimate'], 'Margin': Z_95 * np.sqrt(totals['Variance'])})
+    return result.rename_axis(group_col or 'Group').reset_index()
+
+
+def table_exists(table_name):
+    """Checks whether a table has been created in the database."""
+    df = run_query(f"SELECT name FROM sqlite_master WHERE type = 'table' AND name = '{table_name}';")
+    return not df.empty
+
+
+def filter_by_date_range(df, date_range):
+    """Keeps the rows of `df` that fall inside the sidebar date range."""
+    if len(date_range) == 2:
+        start_date, end_date = sorted(date_range)
+        return df[(df['Date'].dt.date >= start_date) & (df['Date'].dt.date <= end_date)]
+    elif len(date_range) == 1:
+        return df[df['Date'].dt.date == date_range[0]]
+    return df
+
+
+def date_range_mask(df, date_range):
+    """Boolean mask of the rows of `df` that fall inside the sidebar date range."""
+    return df.index.isin(filter_by_date_range(df, date_range).index)
+
+
 st.set_page_config(layout="wide", page_title="Personal Expense Tracker", page_icon="💰")
 
 
@@ -57,15 +108,42 @@ def load_all_data():
         df['DayOfWeek'] = df['Date'].dt.day_name()
     return df
 
-all_expenses_df = load_all_data()
+@st.cache_data
+def load_sample_data():
+    """Loads the stratified sample with the stratum sizes needed to scale it up."""
+
+    df = run_query(f"""
+        SELECT s.*, t.Stratum_Rows, t.Sample_Rows
+        FROM {SAMPLE_TABLE} s
+        JOIN {STRATA_TABLE} t ON s.Month = t.Month AND s.Category = t.Category
+        ORDER BY s.Date;
+    """)
+    if not df.empty:
+        df['Date'] = pd.to_datetime(df['Date'])
+    return df
 
-if all_expenses_df.empty:
-    st.error("No data found in the database. Please ensure `database_setup.py` was run correctly and the `expenses.db` file exists and is populated.")
-    st.stop() 
+@st.cache_data
+def load_date_bounds():
+    """Reads the first and last expense dates without loading the full table."""
+    df = run_query("SELECT MIN(Date) AS Min_Date, MAX(Date) AS Max_Date FROM expenses;")
+    if df.empty or df['Min_Date'].iloc[0] is None:
+        return None, None
+    return pd.to_datetime(df['Min_Date'].iloc[0]).date(), pd.to_datetime(df['Max_Date'].iloc[0]).date()
+
+sample_available = table_exists(SAMPLE_TABLE) and table_exists(STRATA_TABLE)
+approximate_mode = st.sidebar.toggle(
+    "Approximate mode (sampled)",
+    value=False,
+    disabled=not sample_available,
+    help="Dashboard charts are estimated from a month x category stratified sample, so they stay fast on large histories. "
+         "Re-run `database_setup.py` to build the sample if this option is disabled."
+)
 
+min_date, max_date = load_date_bounds()
 
-min_date = all_expenses_df['Date'].min().date()
-max_date = all_expenses_df['Date'].max().date()
+if min_date is None:
+    st.error("No data found in the database. Please ensure `database_setup.py` was run correctly and the `expenses.db` file exists and is populated.")
+    st.stop() 
 
 st.sidebar.subheader("Filter Data")
 date_range = st.sidebar.date_input(
@@ -76,41 +154,80 @@ date_range = st.sidebar.date_input(
 )
 
 
-filtered_df = all_expenses_df
-if len(date_range) == 2:
-    start_date, end_date = sorted(date_range)
-    filtered_df = all_expenses_df[(all_expenses_df['Date'].dt.date >= start_date) &
-                                  (all_expenses_df['Date'].dt.date <= end_date)]
-elif len(date_range) == 1:
-    start_date = date_range[0]
-    filtered_df = all_expenses_df[all_expenses_df['Date'].dt.date == start_date]
-
-
 if page == "Dashboard Overview":
     st.header("📊 Overall Spending Habits")
 
+    use_approximate = approximate_mode
+    if approximate_mode:
+        badge_col, button_col = st.columns([4, 1])
+        with button_col:
+            use_approximate = not st.button("Compute exact results")
+        with badge_col:
+            if use_approximate:
+                st.warning("≈ **Approximate** — figures are estimated from a stratified sample; "
+                           "± values and error bars show 95% confidence intervals.")
+            else:
+                st.success("Showing exact results computed over all transactions.")
+
+    if use_approximate:
+        sample_df = load_sample_data()
+        sample_df = sample_df.assign(Transactions=1.0)
+        in_range = date_range_mask(sample_df, date_range)
+
+        spent = estimate_sum(sample_df, 'Amount_Paid', mask=in_range)
+        cashback = estimate_sum(sample_df, 'Cashback', mask=in_range)
+        transactions = estimate_sum(sample_df, 'Transactions', mask=in_range)
+
+        total_spent, spent_margin = spent['Amount_Paid'].iloc[0], spent['Margin'].iloc[0]
+        total_cashback, cashback_margin = cashback['Cashback'].iloc[0], cashback['Margin'].iloc[0]
+        num_transactions, transactions_margin = transactions['Transactions'].iloc[0], transactions['Margin'].iloc[0]
+
+        monthly_spending = estimate_sum(sample_df, 'Amount_Paid', group_col='Month', mask=in_range)
+        category_spending = estimate_sum(sample_df, 'Amount_Paid', group_col='Category', mask=in_range)
+        payment_mode_spending = estimate_sum(sample_df, 'Amount_Paid', group_col='Payment_Mode', mask=in_range)
+        monthly_cashback = estimate_sum(sample_df, 'Cashback', group_col='Month', mask=in_range)
+
+        # Groups that have no sampled rows in the range are dropped rather than charted as zero.
+        in_range_months = sample_df.loc[in_range, 'Month'].unique()
+        monthly_spending = monthly_spending[monthly_spending['Month'].isin(in_range_months)]
+        monthly_cashback = monthly_cashback[monthly_cashback['Month'].isin(in_range_months)]
+        category_spending = category_spending[category_spending['Category'].isin(sample_df.loc[in_range, 'Category'])]
+        payment_mode_spending = payment_mode_spending[payment_mode_spending['Payment_Mode'].isin(sample_df.loc[in_range, 'Payment_Mode'])]
+    else:
+        filtered_df = filter_by_date_range(load_all_data(), date_range)
+
+        total_spent, spent_margin = filtered_df['Amount_Paid'].sum(), None
+        total_cashback, cashback_margin = filtered_df['Cashback'].sum(), None
+        num_transactions, transactions_margin = len(filtered_df), None
+
+        monthly_spending = filtered_df.groupby('Month')['Amount_Paid'].sum().reset_index()
+        category_spending = filtered_df.groupby('Category')['Amount_Paid'].sum().reset_index()
+        payment_mode_spending = filtered_df.groupby('Payment_Mode')['Amount_Paid'].sum().reset_index()
+        monthly_cashback = filtered_df.groupby('Month')['Cashback'].sum().reset_index()
+
+    error_col = 'Margin' if use_approximate else None
+
     # Metrics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        total_spent = filtered_df['Amount_Paid'].sum()
-        st.metric("Total Spending", f"₹{total_spent:,.2f}")
+        st.metric("Total Spending", f"₹{total_spent:,.2f}",
+                  help=f"± ₹{spent_margin:,.2f}" if spent_margin is not None else None)
     with col2:
-        total_cashback = filtered_df['Cashback'].sum()
-        st.metric("Total Cashback Received", f"₹{total_cashback:,.2f}")
+        st.metric("Total Cashback Received", f"₹{total_cashback:,.2f}",
+                  help=f"± ₹{cashback_margin:,.2f}" if cashback_margin is not None else None)
     with col3:
-        num_transactions = len(filtered_df)
-        st.metric("Total Transactions", f"{num_transactions}")
+        st.metric("Total Transactions", f"{num_transactions:,.0f}",
+                  help=f"± {transactions_margin:,.0f}" if transactions_margin is not None else None)
     with col4:
-        avg_transaction = filtered_df['Amount_Paid'].mean()
+        avg_transaction = total_spent / num_transactions if num_transactions else float('nan')
         st.metric("Avg. Transaction Value", f"₹{avg_transaction:,.2f}")
 
     st.markdown("---")
 
     
     st.subheader("Monthly Spending Trend")
-    monthly_spending = filtered_df.groupby('Month')['Amount_Paid'].sum().reset_index()
     fig_monthly_spending = px.line(monthly_spending, x='Month', y='Amount_Paid',
-                                   title='Total Spending Per Month', markers=True,
+                                   title='Total Spending Per Month', markers=True, error_y=error_col,
                                    labels={'Amount_Paid': 'Amount (₹)', 'Month': 'Month'},
                                    height=400)
     st.plotly_chart(fig_monthly_spending, use_container_width=True)
@@ -121,9 +238,8 @@ if page == "Dashboard Overview":
 
     with col_vis1:
         st.subheader("Spending by Category")
-        category_spending = filtered_df.groupby('Category')['Amount_Paid'].sum().reset_index()
         fig_category = px.bar(category_spending.sort_values(by='Amount_Paid', ascending=False),
-                              x='Amount_Paid', y='Category', orientation='h',
+                              x='Amount_Paid', y='Category', orientation='h', error_x=error_col,
                               title='Total Spending Per Category',
                               labels={'Amount_Paid': 'Amount (₹)', 'Category': 'Category'},
                               height=450)
@@ -131,7 +247,6 @@ if page == "Dashboard Overview":
 
     with col_vis2:
         st.subheader("Spending by Payment Mode")
-        payment_mode_spending = filtered_df.groupby('Payment_Mode')['Amount_Paid'].sum().reset_index()
         fig_payment = px.pie(payment_mode_spending, values='Amount_Paid', names='Payment_Mode',
                              title='Spending Distribution by Payment Mode',
                              hole=0.3,
@@ -142,9 +257,8 @@ if page == "Dashboard Overview":
 
     
     st.subheader("Monthly Cashback Trend")
-    monthly_cashback = filtered_df.groupby('Month')['Cashback'].sum().reset_index()
     fig_cashback_trend = px.line(monthly_cashback, x='Month', y='Cashback',
-                                 title='Total Cashback Received Per Month', markers=True,
+                                 title='Total Cashback Received Per Month', markers=True, error_y=error_col,
                                  labels={'Cashback': 'Cashback (₹)', 'Month': 'Month'},
                                  height=400, color_discrete_sequence=['green'])
     st.plotly_chart(fig_cashback_trend, use_container_width=True)
@@ -504,7 +618,7 @@ elif page == "Raw Data Viewer":
     st.markdown("Here you can view the raw simulated expense data.")
 
 
-    st.dataframe(all_expenses_df, use_container_width=True)
+    st.dataframe(load_all_data(), use_container_width=True)
 
 st.sidebar.markdown("---")
 st.sidebar.info("Developed with Streamlit for Financial Insights.")
\ No newline at end of file
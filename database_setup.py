@@ -4,6 +4,28 @@ import sqlite3
 from generate_data import generate_expense_data 
 
 DB_NAME = 'expenses.db'
+SAMPLE_TABLE = 'expenses_sample'
+STRATA_TABLE = 'expenses_strata'
+SAMPLE_ROWS_PER_STRATUM = 30
+
+
+def build_stratified_sample(df: pd.DataFrame, rows_per_stratum: int = SAMPLE_ROWS_PER_STRATUM, seed: int = 42):
+    """Draws up to `rows_per_stratum` random rows from every month x category stratum.
+
+    Returns the sampled rows and a per-stratum table holding the full row count
+    (Stratum_Rows) and the sampled row count (Sample_Rows) used to scale estimates.
+    """
+    df = df.assign(Month=pd.to_datetime(df['Date']).dt.strftime('%Y-%m'))
+    sample_df = (df.sample(frac=1, random_state=seed)
+                   .groupby(['Month', 'Category'])
+                   .head(rows_per_stratum)
+                   .sort_values('Date'))
+
+    strata_df = (df.groupby(['Month', 'Category']).size().rename('Stratum_Rows').to_frame()
+                   .join(sample_df.groupby(['Month', 'Category']).size().rename('Sample_Rows'))
+                   .reset_index())
+    return sample_df, strata_df
+
 
 def setup_database(df: pd.DataFrame):
     conn = None
@@ -32,6 +54,39 @@ def setup_database(df: pd.DataFrame):
         df.to_sql('expenses', conn, if_exists='append', index=False)
         print(f"Successfully loaded {len(df)} records into 'expenses' table.")
 
+        cursor.execute("CREATE INDEX idx_expenses_date ON expenses (Date);")
+
+        
+        cursor.execute(f"DROP TABLE IF EXISTS {SAMPLE_TABLE};")
+        cursor.execute(f"DROP TABLE IF EXISTS {STRATA_TABLE};")
+        cursor.execute(f'''
+            CREATE TABLE {SAMPLE_TABLE} (
+                Date TEXT NOT NULL,
+                Month TEXT NOT NULL,
+                Category TEXT NOT NULL,
+                Payment_Mode TEXT NOT NULL,
+                Description TEXT,
+                Amount_Paid REAL NOT NULL,
+                Cashback REAL DEFAULT 0.0
+            );
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE {STRATA_TABLE} (
+                Month TEXT NOT NULL,
+                Category TEXT NOT NULL,
+                Stratum_Rows INTEGER NOT NULL,
+                Sample_Rows INTEGER NOT NULL,
+                PRIMARY KEY (Month, Category)
+            );
+        ''')
+        conn.commit()
+
+        sample_df, strata_df = build_stratified_sample(df)
+        sample_df.to_sql(SAMPLE_TABLE, conn, if_exists='append', index=False)
+        strata_df.to_sql(STRATA_TABLE, conn, if_exists='append', index=False)
+        print(f"Stratified sample of {len(sample_df)} records across {len(strata_df)} month x category strata "
+              f"loaded into '{SAMPLE_TABLE}'.")
+
     except sqlite3.Error as e:
         print(f"Database error: {e}")
     finally:
@@ -213,4 +213,13 @@ FROM expenses;
 SELECT STRFTIME('%Y-%m', Date) AS Month, Category, SUM(Amount_Paid) AS Monthly_Category_Spending
 FROM expenses
 GROUP BY Month, Category
-ORDER BY Month, Category;
\ No newline at end of file
+ORDER BY Month, Category;
+
+-- Approximate mode: stratified-sample estimate of total spending per month.
+-- Each month x category stratum is scaled by Stratum_Rows / Sample_Rows; the app adds
+-- 95% confidence intervals on top of these point estimates.
+SELECT s.Month, SUM(s.Amount_Paid * t.Stratum_Rows * 1.0 / t.Sample_Rows) AS Estimated_Monthly_Spending
+FROM expenses_sample s
+JOIN expenses_strata t ON s.Month = t.Month AND s.Category = t.Category
+GROUP BY s.Month
+ORDER BY s.Month;